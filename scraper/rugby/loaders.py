@@ -60,10 +60,6 @@ class MatchStatsLoader(ItemLoader):
     default_input_processor = MapCompose(missing_values, parse_stats)
     default_output_processor = TakeFirst()
 
-class MatchExtraStatsLoader(ItemLoader):
-    default_input_processor = MapCompose(int)
-    default_output_processor = TakeFirst()
-
 class VenueLoader(ItemLoader):
     default_output_processor = TakeFirst()
 
@@ -92,9 +88,3 @@ class PlayerStatsLoader(ItemLoader):
 class PlayerExtraStatsLoader(ItemLoader):
     default_input_processor = MapCompose(int)
     default_output_processor = TakeFirst()
-
-class GameEventLoader(ItemLoader):
-    default_input_processor = MapCompose(int)
-    default_output_processor = TakeFirst()
-
-    action_type_in = MapCompose(lambda x: x if x in ["tries", "pens", "cons", "drops"] else None)
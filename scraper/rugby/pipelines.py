@@ -51,7 +51,7 @@ class RugbyScraperPipeline(object):
             session.commit()
         except Exception as e:
             session.rollback()
-            self.logger.error("Error while committing to DB : {}".format(e))
+            self.logger.error("Error while committing to DB : %s", e)
         finally:
             session.close()
 
@@ -60,7 +60,7 @@ class RugbyScraperPipeline(object):
     def _generic_insert(self, session, model, item):
         if not model or not item:
             return
-        self.logger.info("Inserting entry of type \"{}\" in DB".format(item.__class__.__name__))
+        self.logger.info("Inserting entry of type \"%s\" in DB", item.__class__.__name__)
         return session.add(model(**item))
 
     def _unique_insert(self, session, model, item):
@@ -71,7 +71,7 @@ class RugbyScraperPipeline(object):
         if not session.query(model).filter(model.id == instance.id).first():
             return self._generic_insert(session, model, item)
         else:
-            self.logger.info("\"{}\" already existing in DB".format(item.__class__.__name__))
+            self.logger.info("\"%s\" already existing in DB", item.__class__.__name__)
 
     def _insert_or_update(self, session, model, item, **filters):
         if not model or not item:
@@ -83,4 +83,4 @@ class RugbyScraperPipeline(object):
             return self._generic_insert(session, model, item)
         else:
             session.query(model).filter_by(**filters).update(item)
-            self.logger.info("Updating \"{}\" item.".format(item.__class__.__name__))
+            self.logger.info("Updating \"%s\" item.", item.__class__.__name__)
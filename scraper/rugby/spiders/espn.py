@@ -1,17 +1,212 @@
 # -*- coding: utf-8 -*-
 
-import regex
+import os
+import re
+import logging
 from pprint import pprint
 
+from array import array
+from functools import lru_cache
 from urllib.parse import urljoin
-from collections import defaultdict, OrderedDict
+from collections import defaultdict
+
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+
+from twisted.internet.threads import deferToThread
 
 from scrapy import Request
 from scrapy.spiders import Spider
 from scrapy.exceptions import CloseSpider
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+
+from rugby import models, settings
 from rugby.items import Match, MatchStats, Team, Player, PlayerStats, GameEvent, MatchExtraStats, PlayerExtraStats, Venue
-from rugby.loaders import MatchLoader, MatchStatsLoader, TeamLoader, PlayerLoader, PlayerStatsLoader, GameEventLoader, MatchExtraStatsLoader, PlayerExtraStatsLoader, VenueLoader
+from rugby.loaders import MatchLoader, MatchStatsLoader, TeamLoader, PlayerLoader, PlayerStatsLoader, PlayerExtraStatsLoader, VenueLoader
+
+# Selectors are evaluated for every row of every page : rather than letting parsel translate and
+# lxml compile the same queries over and over, compile them once and keep them around.
+_css_translator = HTMLTranslator()
+
+@lru_cache(maxsize=512)
+def _compile_xpath(query):
+    """ Returns the compiled lxml XPath of a query """
+    return etree.XPath(query, namespaces = {"re": "http://exslt.org/regular-expressions"}, smart_strings = False)
+
+@lru_cache(maxsize=512)
+def _compile_css(query):
+    """ Returns the compiled lxml XPath of a CSS query (parsel pseudo-elements included) """
+    return _compile_xpath(_css_translator.css_to_xpath(query))
+
+def _select(selector, compiled, query):
+    """ Evaluates a compiled query against a parsel selector (or selector list) and wraps the results like parsel does """
+    if isinstance(selector, list):
+        return selector.__class__(x for item in selector for x in _select(item, compiled, query))
+    result = compiled(selector.root)
+    if type(result) is not list:
+        result = [result]
+    return selector.selectorlist_cls(
+        selector.__class__(root = x, type = selector.type, namespaces = selector.namespaces, _expr = query)
+        for x in result)
+
+def _css(selector, query):
+    """ Cached equivalent of selector.css(query) """
+    return _select(selector, _compile_css(query), query)
+
+def _xpath(selector, query):
+    """ Cached equivalent of selector.xpath(query) """
+    return _select(selector, _compile_xpath(query), query)
+
+def _cell_texts(row):
+    """ Returns the first text node of each td cell of a table row (None for cells without text).
+    Works on the lxml tree directly, so a whole row is read without building any intermediate selector """
+    first_text = _compile_xpath("text()[1]")
+    return [next(iter(first_text(cell)), None) for cell in _compile_xpath("td")(row.root)]
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name):
+    """ Returns the upper-cased words of a player name, its first letter, its last name and its full name
+    (words joined by single spaces). Cached as the same names are looked up for every score and player stats row of every match """
+    words = tuple(name.upper().strip().split(" "))
+    return words, words[0][:1], words[-1], " ".join(word for word in words if word)
+
+# Labels of the search categories (home_or_away parameter)
+_CAT_LABEL = { 1: "Home", 3: "Neutral" }
+
+# Supported score types of the scorers summary, and their index in the per-player score counts
+_SCORE_TYPES = ("tries", "cons", "pens", "drops")
+_SCORE_INDEX = { score_type: i for i, score_type in enumerate(_SCORE_TYPES) }
+_NO_SCORES = (0,) * len(_SCORE_TYPES)
+
+# Fields a Match() item must have to follow its match page
+_REQUIRED_MATCH_KEYS = frozenset(["id", "home_team_id", "away_team_id", "match_type", "won", "date"])
+
+# Patterns used to parse the match page, compiled once at import time
+_PENS_RE = re.compile(r"[0-9]+ from ([0-9]+)")
+_DROPS_RE = re.compile(r"([0-9]+)( \(([0-9]+) missed\))?")
+_RUCKS_RE = re.compile(r"^\n([0-9]+) from ([0-9]+)") # Rucks and mauls
+_SCRUMS_RE = re.compile(r"^\n\t  ([0-9]+) won, ([0-9]+) lost") # Scrums and lineouts
+_KRP_RE = re.compile(r"^([0-9]+)/([0-9]+)/([0-9]+)$")
+_HEADLINE_NAME_RE = re.compile(r"([a-zA-Z ]+)")
+_HEADLINE_SCORE_RE = re.compile(r"(\d+)(?!G)")
+_SPLIT_EVENTS_RE = re.compile(r"\,(?! \d)")
+# Translation table dropping line breaks and tabs from text nodes
+_WS_TRANS = str.maketrans("", "", "\n\r\t")
+
+def _parse_event(event):
+    """ Splits a scorer entry, "Name 2(12, 45)", into its name, occurences and times.
+    Tokenized by hand with partition/split, the format being simple enough to do without a regex """
+    head, sep, tail = event.partition("(")
+    # Times are separated by commas and/or spaces, up to the closing parenthesis
+    times = [time for time in tail.partition(")")[0].replace(",", " ").split() if time.isdecimal()] if sep else []
+    # Strip the trailing digits (number of occurences) of the name
+    head = head.rstrip()
+    i = len(head)
+    while i > 0 and (head[i - 1].isdecimal() or head[i - 1] == " "):
+        i -= 1
+    # One entry per digit, as the former regex captured them
+    occurences = [digit for digit in head[i:] if digit != " "]
+    return head[:i].strip(), occurences, times
+
+def _cell_groups_parser(pattern):
+    """ Builds a stats cell parser returning the groups of pattern as ints """
+    def parser(value):
+        parsed = pattern.match(value)
+        return tuple(int(group) for group in parsed.groups()) if parsed else None
+    return parser
+
+def _cell_pair_parser(value):
+    """ Stats cell parser for "A/B" cells. Those are the most common ones, partition is much cheaper than a regex """
+    first, sep, second = value.strip().partition("/")
+    if sep and first.isdecimal() and second.isdecimal():
+        return int(first), int(second)
+    return None
+
+def _cell_int_parser(value):
+    """ Stats cell parser for plain integer cells """
+    return (int(value),)
+
+# Team stats of the "Match stats" tab that are plain integers, indexed by title
+_STAT_CODES = {
+    "Kicks from hand": "kicks",
+    "Passes": "passes",
+    "Runs": "runs",
+    "Metres run with ball": "meters",
+    "Clean breaks": "breaks",
+    "Defenders beaten": "def_beaten",
+    "Offloads": "offloads",
+    "Turnovers conceded": "turnovers",
+    "Penalties conceded": "pens_conceded",
+}
+
+def _stat_parser(cell_parser, *metrics):
+    """ Builds a "Match stats" row parser that maps the values returned by cell_parser to metrics.
+    Row parsers take the values and ids of both teams and yield (metric, { team_id: value }) tuples """
+    def parser(values, ids):
+        parsed = [(team_id, cell_parser(value)) for team_id, value in zip(ids, values)]
+        for i, metric in enumerate(metrics):
+            scores = { team_id: cells[i] for team_id, cells in parsed if cells }
+            if scores:
+                yield metric, scores
+    return parser
+
+def _int_stat_parser(metric):
+    """ Builds a "Match stats" row parser for plain integer metrics """
+    def parser(values, ids):
+        yield metric, { team_id: int(value) for team_id, value in zip(ids, values) }
+    return parser
+
+def _parse_drops_stat(values, ids):
+    """ Attempted drops are reported as "scored (missed missed)" """
+    scores = {}
+    for team_id, value in zip(ids, values):
+        drops_re = _DROPS_RE.match(value)
+        if not drops_re:
+            continue
+        drops_scored = int(drops_re.group(1))
+        drops_missed = drops_re.group(3)
+        drops_missed = int(drops_missed) if drops_missed else 0
+        scores[team_id] = drops_scored + drops_missed
+    if scores:
+        yield "drops_attempt", scores
+
+# Value parser for each supported row of the "Match stats" tab, indexed by title
+_STAT_PARSERS = {
+    "Penalty goals": _stat_parser(_cell_groups_parser(_PENS_RE), "pens_attempt"),
+    "Dropped goals": _parse_drops_stat,
+    "Rucks won": _stat_parser(_cell_groups_parser(_RUCKS_RE), "rucks_won", "rucks_init"),
+    "Mauls won": _stat_parser(_cell_groups_parser(_RUCKS_RE), "mall_won", "mall_init"),
+    "Tackles made/missed": _stat_parser(_cell_pair_parser, "tackles_made", "tackles_missed"),
+    "Scrums on own feed": _stat_parser(_cell_groups_parser(_SCRUMS_RE), "scrums_won_on_feed", "scrums_lost_on_feed"),
+    "Lineouts on own throw": _stat_parser(_cell_groups_parser(_SCRUMS_RE), "lineouts_won_on_throw", "lineouts_lost_on_throw"),
+    "Yellow/red cards": _stat_parser(_cell_pair_parser, "yellow_cards", "red_cards"),
+}
+_STAT_PARSERS.update({ title: _int_stat_parser(metric) for title, metric in _STAT_CODES.items() })
+
+# Columns of the "{team} stats" tables : (column number, stats keys, cell parser returning one value per key)
+_PLAYER_COLS = [
+    (3, ("tries", "assists"), _cell_pair_parser),
+    (4, ("points",), _cell_int_parser),
+    (5, ("kicks", "passes", "runs"), _cell_groups_parser(_KRP_RE)),
+    (6, ("meters",), _cell_int_parser),
+    (7, ("breaks",), _cell_int_parser),
+    (8, ("def_beaten",), _cell_int_parser),
+    (9, ("offloads",), _cell_int_parser),
+    (10, ("turnovers",), _cell_int_parser),
+    (11, ("tackles_made", "tackles_missed"), _cell_pair_parser),
+    (12, ("lineouts_won_on_throw", "lineouts_stolen_from_opp"), _cell_pair_parser),
+    (13, ("pens_conceded",), _cell_int_parser),
+    (14, ("yellow_cards", "red_cards"), _cell_pair_parser),
+]
+
+def _as_bool(value):
+    """ Spider arguments (-a name=value) are passed as strings, so "0" or "false" must turn a flag off """
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
 
 class ESPN(Spider):
     """Main spider of the scraper, targeting http://stats.espnscrum.com"""
@@ -22,6 +217,8 @@ class ESPN(Spider):
 
     # Custom params
     follow_pages = True
+    skip_known_players = True # Don't request the pages of players already stored in DB
+    parse_in_thread = False # Parse match pages in the reactor thread pool instead of streaming their items
     categories = [1, 3]
     start_domain = "http://stats.espnscrum.com/"
     search_path = "/statsguru/rugby/stats/index.html"
@@ -33,20 +230,46 @@ class ESPN(Spider):
         "view": "match",
     }
 
+    def __init__(self, *args, **kwargs):
+        super(ESPN, self).__init__(*args, **kwargs)
+        # Flags can be overridden with spider arguments
+        self.skip_known_players = _as_bool(self.skip_known_players)
+        self.parse_in_thread = _as_bool(self.parse_in_thread)
+        # Ids of the players whose page has already been requested
+        self._seen_players = set()
+        # Search urls only differ by their query string
+        self._search_base = urljoin(self.start_domain, self.search_path) + "?"
+
+    def _load_known_players(self):
+        """ Returns the ids of the players already stored in DB by previous crawls """
+        if not os.path.exists(settings.SQLITE_ABS_PATH):
+            return set()
+        engine = create_engine("sqlite:///" + settings.SQLITE_ABS_PATH)
+        session = sessionmaker(bind = engine)()
+        try:
+            return { player_id for player_id, in session.query(models.Player.id) }
+        except SQLAlchemyError as e:
+            self.logger.warning("Can't load known players from DB : %s", e)
+            return set()
+        finally:
+            session.close()
+            engine.dispose()
+
     def _generate_query_params(self, home_or_away = 1, page = 1):
-        search_params = OrderedDict([
-            ("class", 1), # ?,
-            ("home_or_away", home_or_away), # Only returns home team entries
-            ("orderby", "date"),
-            ("orderbyad", "reverse"),
-            ("page", page),
-            ("size", 100), # Results per page
-            ("spanmin1", "24+Jul+1992"), # Lower bound date
-            ("spanval1", "span"), # ?
-            ("template", "results"),
-            ("type", "team"),
-            ("view", "match"),
-        ])
+        # Plain dicts keep the insertion order, which is the order of the query string
+        search_params = {
+            "class": 1, # ?,
+            "home_or_away": home_or_away, # Only returns home team entries
+            "orderby": "date",
+            "orderbyad": "reverse",
+            "page": page,
+            "size": 100, # Results per page
+            "spanmin1": "24+Jul+1992", # Lower bound date
+            "spanval1": "span", # ?
+            "template": "results",
+            "type": "team",
+            "view": "match",
+        }
         return search_params
 
     def _generate_query_string(self, query_params):
@@ -54,13 +277,9 @@ class ESPN(Spider):
         key_values = ["{}={}".format(k, v) for k, v in query_params.items()]
         return sep.join(key_values)
 
-    def _generate_url(self, domain, path, query_params):
-        query_string = self._generate_query_string(query_params)
-        return urljoin(domain, "{}?{}".format(path, query_string))
-
     def _generate_search_url(self, **params):
         query_params = self._generate_query_params(**params)
-        return self._generate_url(domain = self.start_domain, path = self.search_path, query_params = query_params)
+        return self._search_base + self._generate_query_string(query_params)
 
     def _generate_search_request(self, **params):
         return Request(
@@ -75,10 +294,16 @@ class ESPN(Spider):
         - ordered by date
         - grouped by home or away
         """
+        # Players stored by previous crawls already have their info, no need to request their page again
+        if self.skip_known_players:
+            known_players = self._load_known_players()
+            self._seen_players.update(known_players)
+            self.logger.info("%s players already in DB, their pages won't be requested", len(known_players))
+
         # Go !
         page = 1
         for category in self.categories:
-            self.logger.info("Scraping page {} - {} matches".format(page, "Home" if category == 1 else "Neutral"))
+            self.logger.info("Scraping page %s - %s matches", page, _CAT_LABEL[category])
             yield self._generate_search_request(page = page, home_or_away = category)
 
     def match_list_parse(self, response):
@@ -87,11 +312,11 @@ class ESPN(Spider):
         """
 
         # Check if there are matches left to parse on the page.
-        rows = response.css("tr.data1")
+        rows = _css(response.selector, "tr.data1")
         if len(rows) == 1:
-            msg = rows[0].css("td b::text").extract_first()
+            msg = _css(rows[0], "td b::text").extract_first()
             if msg and "No records" in msg.strip():
-                self.logger.info("Finished scraping for category \"{}\" !".format("Home" if response.meta["home_or_away"] == 1 else "Neutral"))
+                self.logger.info("Finished scraping for category \"%s\" !", _CAT_LABEL[int(response.meta["home_or_away"])])
                 self.categories.remove(int(response.meta["home_or_away"]))
 
         # If we've finished the scraping for all categories, we can close the spider
@@ -111,37 +336,34 @@ class ESPN(Spider):
             "date": "td:nth-child(13) b::text"
         }
 
-        # Variable storing the index offset between the side menu divs and the rows
-        offset = None
-
-        for index, links in enumerate(response.css(".engine-dd")):
-            if links.css("[id^=\"engine-dd-\"]"):
-                # Skip the UI divs
-                continue
-
-            if not offset:
-                offset = index - 1
+        # Side menu divs, one per row of the table (the UI divs, which have an "engine-dd-*" id themselves
+        # or contain an element that has one, are filtered out)
+        menu_divs = _xpath(response.selector, "//*[contains(concat(' ', normalize-space(@class), ' '), ' engine-dd ')]"
+            "[not(starts-with(@id, 'engine-dd-')) and not(.//*[starts-with(@id, 'engine-dd-')])]")
 
-            # 1) Extract the basic match info into the Match structure
+        for index, _ in enumerate(menu_divs, 1):
+            # 1) Extract the basic match info into the Match structure. Values are selected
+            #    with the cached selectors and fed to a single loader (no nested loaders)
             loader = MatchLoader(item = Match(), response = response)
-            # Subloader that handles the links in the side menu divs
-            link_block_loader = loader.nested_css("#engine-dd{}".format(index - offset))
+            add = loader.add_value
+            # Links in the side menu divs
+            link_block = _css(response.selector, "#engine-dd{}".format(index))
             for field, selector in id_fields.items():
-                link_block_loader.add_css(field, selector, re = "\/([0-9]+)\.")
-            # Subloader that handles the match info in the table rows (won, date)
-            table_row_loader = loader.nested_css("tr.data1:nth-child({})".format(index - offset))
+                add(field, _css(link_block, selector).extract(), re = "\/([0-9]+)\.")
+            # Match info in the table rows (won, date)
+            table_row = _css(response.selector, "tr.data1:nth-child({})".format(index))
             for field, selector in meta_fields.items():
-                table_row_loader.add_css(field, selector)
+                add(field, _css(table_row, selector).extract())
             # Computed values
-            loader.add_value("match_type", response.meta["home_or_away"])
+            add("match_type", response.meta["home_or_away"])
             # Fetch the data
             match = loader.load_item()
 
-            if any(k not in match.keys() for k in ["id", "home_team_id", "away_team_id", "match_type", "won", "date"]):
+            if not _REQUIRED_MATCH_KEYS.issubset(match.keys()):
                 # Better safe than sorry
                 self.logger.error("Missing IDs for match. Skipping ...")
                 continue
-            self.logger.info("Found match ! ID : {}".format(match["id"]))
+            self.logger.info("Found match ! ID : %s", match["id"])
 
             yield response.follow(
                 url = "/statsguru/rugby/match/{}.html".format(match["id"]),
@@ -154,7 +376,7 @@ class ESPN(Spider):
             category = int(response.meta["home_or_away"])
             if category in self.categories:
                 page = int(response.meta["page"]) + 1
-                self.logger.info("Scraping page {} - {} matches".format(page, "Home" if category == 1 else "Neutral"))
+                self.logger.info("Scraping page %s - %s matches", page, _CAT_LABEL[category])
                 yield self._generate_search_request(page = page, home_or_away=category)
 
     def player_info_parse(self, response):
@@ -169,15 +391,16 @@ class ESPN(Spider):
             "Weight": "weight"
         }
 
-        infos = response.css("#scrumPlayerContent table .scrumPlayerDesc")
+        infos = _css(response.selector, "#scrumPlayerContent table .scrumPlayerDesc")
         if infos:
             loader = PlayerLoader(item = response.meta["player_info"], response = response)
+            # Title and value of an info, joined by the XPath itself to get both in a single evaluation
+            title_and_value = _compile_xpath("concat(b/text(), '|', text())")
             for info in infos:
-                title = info.xpath("b/text()").extract_first()
-                if title and title in fields.keys():
-                    value = info.xpath("text()").extract_first()
-                    if value:
-                        loader.add_value(fields.get(title), value.strip())
+                title, _, value = title_and_value(info.root).partition("|")
+                field = fields.get(title)
+                if field and value:
+                    loader.add_value(field, value.strip())
             yield loader.load_item()
 
 
@@ -186,7 +409,7 @@ class ESPN(Spider):
         the real processing. Checks that data is available in iframe.
         """
         # Extract iframe url with match data
-        iframe = response.css("#win_old::attr(src)").extract_first()
+        iframe = _css(response.selector, "#win_old::attr(src)").extract_first()
 
         if iframe:
             yield response.follow(
@@ -195,37 +418,42 @@ class ESPN(Spider):
                 meta = response.meta
             )
 
-    def _get_player_id_from_name(self, name, team_dic) :
-        """ Method that allows to get the id of a player from his name and the dic of his team
+    def _build_name_index(self, team_dic):
+        """ Method that builds the name index of a team used by _get_player_id_from_name, from the dic of the team.
+        "full" maps the normalized full names to ids, "last" stores (id, first letter) entries grouped by upper-cased last name """
+        name_index = { "full": {}, "last": defaultdict(list) }
+        for player_id, player_info in team_dic.items():
+            _, first_letter, last_name, full_name = _normalize_name(player_info[0])
+            name_index["last"][last_name].append((player_id, first_letter))
+            # Homonyms can't be told apart by their full name
+            name_index["full"][full_name] = None if full_name in name_index["full"] else player_id
+        return name_index
+
+    def _get_player_id_from_name(self, name, team_index) :
+        """ Method that allows to get the id of a player from his name and the name index of his team
         should accept names as : name, initials name """
-        potential = []
-        final = []
-        name = name.upper().strip()
-        for player_id , player_info in team_dic.items() :
-            player_name = player_info[0].upper().strip()
-            player_name_list = player_name.split(" ")
-            researched_name_list = name.split(" ")
-            if researched_name_list[-1] in player_name_list[-1] :
-                potential.append(player_id)
+        researched_name_list, researched_first_leter, researched_last_name, researched_full_name = _normalize_name(name)
+        # Fast path : the name is exactly the one of the line-up
+        player_id = team_index["full"].get(researched_full_name)
+        if player_id:
+            return player_id
+        # (id, first letter, last name) of the players whose last name contains the researched one
+        potential = [(player_id, first_letter, last_name)
+            for last_name, players in team_index["last"].items() if researched_last_name in last_name
+            for player_id, first_letter in players]
         if len(potential) == 0 :
             raise RuntimeError("no name was detected")
         elif len(potential) == 1 :
-            return potential[0]
+            return potential[0][0]
         else:
             #if all the potentials are equals :
-            if all(potential[0] == rest for rest in potential) :
-                return potential[0]
-            if len(name.split(" ")) == 1 :
+            if all(potential[0][0] == rest[0] for rest in potential) :
+                return potential[0][0]
+            if len(researched_name_list) == 1 :
                 raise RuntimeError("two many names containing the exact researched name")
             else:
-                researched_first_leter = name.split(" ")[0][0]
-                researched_last_name = name.split(" ")[-1]
-                for potential_id in potential :
-                    potential_name = team_dic[potential_id][0].upper().strip()
-                    potential_first_letter = potential_name.split(" ")[0][0]
-                    potential_last_name = potential_name.split(" ")[-1]
-                    if potential_first_letter == researched_first_leter and potential_last_name == researched_last_name:
-                        final.append(potential_id)
+                final = [player_id for player_id, first_letter, last_name in potential
+                    if first_letter == researched_first_leter and last_name == researched_last_name]
                 if len(final) == 1:
                     return final[0]
                 else:
@@ -239,100 +467,23 @@ class ESPN(Spider):
         """ Parser that handles the content of the per-team "Stats" tab.
         Returns the statistic value for each team for each stat. Generator function"""
 
-        stats = tab.css("table tr")
+        stats = _css(tab, "table tr")
         if not stats:
-            self.logger.error("[{}] No data in \"Match stats\" tab, aborting.".format(match["id"]))
+            self.logger.error("[%s] No data in \"Match stats\" tab, aborting.", match["id"])
             return
 
+        ids = [match["home_team_id"], match["away_team_id"]]
         for stat in stats:
-            title = stat.css("td:nth-child(2)::text").extract_first()
-            if not title:
+            # Columns : home value, title, away value
+            texts = _cell_texts(stat)[:3]
+            if len(texts) < 3 or not texts[1]:
                 continue
-            values = [stat.css("td:nth-child({})::text".format(i)).extract_first() for i in [1, 3]]
-            ids = [match["home_team_id"], match["away_team_id"]]
-            if not all(values):
+            parser = _STAT_PARSERS.get(texts[1])
+            values = [texts[0], texts[2]]
+            if not parser or not all(values):
                 continue
-            result = defaultdict(dict)
-
-            for team_id, value in zip(ids, values):
-                # Analysing the data itself
-                if title == "Penalty goals":
-                    cons_attempt_re = regex.match("[0-9]+ from ([0-9]+)", value)
-                    if not cons_attempt_re:
-                        continue
-                    result["pens_attempt"][team_id] = int(cons_attempt_re.captures(1)[0])
-                # Attempted drops
-                if title == "Dropped goals":
-                    drops_re = regex.match("([0-9]+)( \(([0-9]+) missed\))?", value)
-                    if not drops_re:
-                        continue
-                    drops_scored = int(drops_re.captures(1)[0])
-                    drops_missed = drops_re.captures(3)
-                    if not drops_missed:
-                        drops_missed = 0
-                    else:
-                        drops_missed = int(drops_missed[0])
-                    drops_attempt = drops_scored + drops_missed
-                    result["drops_attempt"][team_id] = drops_attempt
-                # Various metrics
-                codes = {
-                    "Kicks from hand": "kicks",
-                    "Passes": "passes",
-                    "Runs": "runs",
-                    "Metres run with ball": "meters",
-                    "Clean breaks": "breaks",
-                    "Defenders beaten": "def_beaten",
-                    "Offloads": "offloads",
-                    "Turnovers conceded": "turnovers",
-                    "Penalties conceded": "pens_conceded",
-                }
-                if title in ["Kicks from hand", "Passes", "Runs", "Metres run with ball", "Clean breaks", "Defenders beaten", "Offloads", "Turnovers conceded", "Penalties conceded"]:
-                    result[codes.get(title)][team_id] = int(value)
-                # Rucks both initiated and won
-                if title == "Rucks won":
-                    rucks_re = regex.match("^\\n([0-9]+) from ([0-9]+)", value)
-                    if not rucks_re:
-                        continue
-                    result["rucks_init"][team_id] = int(rucks_re.captures(2)[0])
-                    result["rucks_won"][team_id] = int(rucks_re.captures(1)[0])
-                #mauls both initiated and won
-                if title == "Mauls won":
-                    mall_re = regex.match("^\\n([0-9]+) from ([0-9]+)", value)
-                    if not mall_re :
-                        continue
-                    result["mall_init"][team_id] = int(mall_re.captures(2)[0])
-                    result["mall_won"][team_id] = int(mall_re.captures(1)[0])
-                #tackles
-                if title == "Tackles made/missed":
-                    tackles_re = regex.match("^([0-9]+)/([0-9]+)$", value)
-                    if not tackles_re :
-                        continue
-                    result["tackles_made"][team_id] = int(tackles_re.captures(1)[0])
-                    result["tackles_missed"][team_id] = int(tackles_re.captures(2)[0])
-                #scrums
-                if title == "Scrums on own feed":
-                    scrums_re = regex.match("^\\n\\t  ([0-9]+) won, ([0-9]+) lost", value)
-                    if not scrums_re:
-                        continue
-                    result["scrums_won_on_feed"][team_id] = int(scrums_re.captures(1)[0])
-                    result["scrums_lost_on_feed"][team_id] = int(scrums_re.captures(2)[0])
-                #lineouts
-                if title == "Lineouts on own throw":
-                    lineout_re = regex.match("^\\n\\t  ([0-9]+) won, ([0-9]+) lost", value)
-                    if not lineout_re:
-                        continue
-                    result["lineouts_won_on_throw"][team_id] = int(lineout_re.captures(1)[0])
-                    result["lineouts_lost_on_throw"][team_id] = int(lineout_re.captures(2)[0])
-                #cards
-                if title == "Yellow/red cards":
-                    cards_re = regex.match("^([0-9]+)/([0-9]+)$", value)
-                    if not cards_re:
-                        continue
-                    result["yellow_cards"][team_id] = int(cards_re.captures(1)[0])
-                    result["red_cards"][team_id] = int(cards_re.captures(2)[0])
-
-            for metric_name, metric_values in result.items():
-                yield metric_name, metric_values
+            # Analysing the data itself
+            yield from parser(values, ids)
 
 
     def _parse_player_stats(self, row, potential_team, potential_team_id ):
@@ -345,11 +496,13 @@ class ESPN(Spider):
         assert len(potential_team) == len(potential_team_id) and len(potential_team) == 2, "potential teams and team ids must be of same length 2"
 
         player_stats = {}
+        # Text of each cell of the row, padded to the 14 columns of the table
+        cells = _cell_texts(row)
+        cells += [None] * (14 - len(cells))
         #getting the player name and deducing his id and his team id
-        player_name = row.css("td:nth-child(2)::text")
+        player_name = cells[1]
         if not player_name :
             return None
-        player_name = player_name.extract_first()
         try :
             home_player_id = self._get_player_id_from_name(player_name, potential_team[0])
         except RuntimeError:
@@ -375,91 +528,12 @@ class ESPN(Spider):
         player_stats["team_id"] = team_id
 
         #getting the statistics
-        #tries and assists
-        tries_assists = row.css("td:nth-child(3)::text")
-        if tries_assists:
-            tries_assists = tries_assists.extract_first()
-            tries_assists_re = regex.match("^([0-9]+)/([0-9])+$", tries_assists)
-            if tries_assists_re:
-                tries = int(tries_assists_re.captures(1)[0])
-                player_stats["tries"] = tries
-                assists = int(tries_assists_re.captures(2)[0])
-                player_stats["assists"] = assists
-        #points
-        points = row.css("td:nth-child(4)::text")
-        if points:
-            points = int(points.extract_first())
-            player_stats["points"] = points
-        #kicks runs passes
-        k_r_p = row.css("td:nth-child(5)::text")
-        if k_r_p:
-            k_r_p = k_r_p.extract_first()
-            k_r_p_re = regex.match("^([0-9]+)/([0-9]+)/([0-9]+)$", k_r_p)
-            if k_r_p_re:
-                kicks = int(k_r_p_re.captures(1)[0])
-                player_stats["kicks"] = kicks
-                passes = int(k_r_p_re.captures(2)[0])
-                player_stats["passes"] = passes
-                runs = int(k_r_p_re.captures(3)[0])
-                player_stats["runs"] = runs
-        #meters ran
-        meters_ran = row.css("td:nth-child(6)::text")
-        if meters_ran:
-            meters_ran = int(meters_ran.extract_first())
-            player_stats["meters"] = meters_ran
-        #clean breacks
-        breaks = row.css("td:nth-child(7)::text")
-        if breaks:
-            breaks = int(breaks.extract_first())
-            player_stats["breaks"] = breaks
-        #defenders beaten
-        defenders_beaten = row.css("td:nth-child(8)::text")
-        if defenders_beaten:
-            defenders_beaten = int(defenders_beaten.extract_first())
-            player_stats["def_beaten"] = defenders_beaten
-        #offloads
-        offloads = row.css("td:nth-child(9)::text")
-        if offloads:
-            offloads = int(offloads.extract_first())
-            player_stats["offloads"] = offloads
-        #turnovers
-        turnovers = row.css("td:nth-child(10)::text")
-        if turnovers:
-            turnovers = int(turnovers.extract_first())
-            player_stats["turnovers"] = turnovers
-        #tackles made and missed
-        tackles = row.css("td:nth-child(11)::text")
-        if tackles:
-            tackles = tackles.extract_first()
-            tackles_re = regex.match("^([0-9]+)/([0-9]+)", tackles)
-            if tackles_re:
-                tackles_made = int(tackles_re.captures(1)[0])
-                player_stats["tackles_made"] = tackles_made
-                tackles_missed = int(tackles_re.captures(2)[0])
-                player_stats["tackles_missed"] = tackles_missed
-        #lineouts
-        lineouts = row.css("td:nth-child(12)::text")
-        if lineouts:
-            lineouts = lineouts.extract_first()
-            lineouts_re = regex.match("^([0-9]+)/([0-9]+)$", lineouts)
-            if lineouts_re:
-                lineouts_won_on_throw = int(lineouts_re.captures(1)[0])
-                player_stats["lineouts_won_on_throw"] = lineouts_won_on_throw
-                lineouts_stolen_from_opp = int(lineouts_re.captures(2)[0])
-                player_stats["lineouts_stolen_from_opp"] = lineouts_stolen_from_opp
-        #penalties conceded
-        pens_conceded = row.css("td:nth-child(13)::text")
-        if pens_conceded:
-            pens_conceded = int(pens_conceded.extract_first())
-            player_stats["pens_conceded"] = pens_conceded
-        #cards
-        cards = row.css("td:nth-child(14)::text")
-        if cards:
-            cards = cards.extract_first()
-            cards_re = regex.match("^([0-9]+)/([0-9]+)", cards)
-            if cards_re:
-                player_stats["yellow_cards"] = int(cards_re.captures(1)[0])
-                player_stats["red_cards"] = int(cards_re.captures(2)[0])
+        for col, keys, parser in _PLAYER_COLS:
+            value = cells[col - 1]
+            if value:
+                parsed = parser(value)
+                if parsed:
+                    player_stats.update(zip(keys, parsed))
 
         return player_stats
 
@@ -468,20 +542,50 @@ class ESPN(Spider):
         """ Main callback that handles the parsing of the match iframe containing most of the data.
         Returns PlayerStats() (enriched) per player, MatchExtraStats() and PlayerExtraStats() if available.
         Redirects to player info page.
+        Items are streamed to the engine as they are parsed. When parse_in_thread is set, the parsing
+        runs in the reactor thread pool instead and Scrapy waits for the returned deferred.
         """
+        if not self.parse_in_thread:
+            return self._iter_match_iframe(response)
+        return deferToThread(self._collect_match_iframe, response).addCallback(self._replay_match_iframe)
+
+    def _collect_match_iframe(self, response):
+        """ Collects the items of _iter_match_iframe() for the threaded path.
+        Returns the items parsed and the parsing error that stopped the generator, if any.
+        """
+        items = []
+        try:
+            for item in self._iter_match_iframe(response):
+                items.append(item)
+        except Exception as e:
+            return items, e
+        return items, None
+
+    def _replay_match_iframe(self, result):
+        """ Yields the items collected in the thread pool, then raises their parsing error.
+        Like when the generator is streamed, the items parsed before the error are kept
+        and the error goes through Scrapy's spider error handling.
+        """
+        items, error = result
+        yield from items
+        if error is not None:
+            raise error
+
+    def _iter_match_iframe(self, response):
+        """ Generator doing the actual parsing of the match iframe, see _match_iframe_parse """
 
         # Get the forwarded match data
         match = response.meta.get('match')
 
         # Start the actual parsing
-        self.logger.info("[{}] Start parsing match data ...".format(match["id"]))
+        self.logger.info("[%s] Start parsing match data ...", match["id"])
 
         # 1) Parse the match headline
-        tokens = response.xpath("//td[@class=\"liveSubNavText1\"]/text()")
+        tokens = _xpath(response.selector, "//td[@class=\"liveSubNavText1\"]/text()")
         if not tokens:
-            self.logger.error("[{}] Can't extract headline. Skipping match ...".format(match["id"]))
+            self.logger.error("[%s] Can't extract headline. Skipping match ...", match["id"])
             return
-        notes = response.xpath("//td[@class=\"liveTblNotes\"]/a/text()")
+        notes = _xpath(response.selector, "//td[@class=\"liveTblNotes\"]/a/text()")
         if len(notes) == 2:
             loader = VenueLoader(item = Venue())
             loader.add_value("id", match["ground_id"])
@@ -489,7 +593,7 @@ class ESPN(Spider):
             venue = loader.load_item()
             yield venue
 
-        headlines = "".join([item.rstrip().replace("\n", "") for item in tokens.extract()]).split(" - ")
+        headlines = "".join([item.translate(_WS_TRANS).rstrip() for item in tokens.extract()]).split(" - ")
         if len(headlines) == 2:
             match_stats = {
                 "scored": 0,
@@ -497,24 +601,25 @@ class ESPN(Spider):
             }
             error = False
             for i, headline in enumerate(headlines):
-                id = match["home_team_id"] if i == 0 else match["away_team_id"]
-                name = regex.findall("([a-zA-Z ]+)", headline)
-                score = regex.findall("(\d+)(?!G)", headline)
+                is_home = i == 0
+                team_id = match["home_team_id"] if is_home else match["away_team_id"]
+                name = _HEADLINE_NAME_RE.findall(headline)
+                score = _HEADLINE_SCORE_RE.findall(headline)
                 if not name or not score:
-                    self.logger.error("[{}] Missing data in headline. Skipping match ...".format(match["id"], id))
+                    self.logger.error("[%s] Missing data in headline. Skipping match ...", match["id"])
                     error = True
                     break
 
                 # Create Team item
                 loader = TeamLoader(item = Team())
-                loader.add_value("id", id)
+                loader.add_value("id", team_id)
                 loader.add_value("name", name[0].strip())
                 team = loader.load_item()
                 yield team
 
                 # Store scores in match_stats dict
                 score = int(score[0].strip())
-                match_stats["scored" if i == 0 else "conceded"] = score
+                match_stats["scored" if is_home else "conceded"] = score
 
             if not error:
                 yield match
@@ -523,24 +628,27 @@ class ESPN(Spider):
 
             # Yield partial MatchStats item
             for i, team_id in enumerate([match["home_team_id"], match["away_team_id"]]):
+                is_home = i == 0
+                scored = match_stats["scored"] if is_home else match_stats["conceded"]
+                conceded = match_stats["conceded"] if is_home else match_stats["scored"]
                 loader = MatchStatsLoader(item = MatchStats())
                 loader.add_value("match_id", match["id"])
                 loader.add_value("team_id", team_id)
-                loader.add_value("scored", match_stats["scored"] if i == 0 else match_stats["conceded"])
-                loader.add_value("conceded", match_stats["conceded"] if i == 0 else match_stats["scored"])
+                loader.add_value("scored", scored)
+                loader.add_value("conceded", conceded)
                 yield loader.load_item()
 
         else:
-            self.logger.error("[{}] Headline can't be parsed. Skipping match ...".format(match["id"]))
+            self.logger.error("[%s] Headline can't be parsed. Skipping match ...", match["id"])
             return
 
         # 2) Get an array of the tabs indexed by title
-        tabs = response.css("#scrumContent .tabbertab")
+        tabs = _css(response.selector, "#scrumContent .tabbertab")
         if not tabs:
-            self.logger.error("[{}] No tabs, aborting.".format(match["id"]))
+            self.logger.error("[%s] No tabs, aborting.", match["id"])
             return # If no tabs, we have no match info, so drop this request
 
-        tabs = [(tab.css("h2::text").extract_first(), tab) for tab in tabs]
+        tabs = [(_css(tab, "h2::text").extract_first(), tab) for tab in tabs]
         tabs = { tab[0]: tab[1] for tab in tabs if tab[0]}
 
         # 3) Get all players in the match from the "Teams" tab. For each team line-up,
@@ -548,203 +656,235 @@ class ESPN(Spider):
         #    - extract match specific info and creates requests to player match page
 
         if "Teams" not in tabs:
-            self.logger.error("[{}] No \"Teams\" tab, aborting.".format(match["id"]))
+            self.logger.error("[%s] No \"Teams\" tab, aborting.", match["id"])
             return # We ain't gonna do nothin' bru
         else:
-            self.logger.info("[{}] Found {} tabs : {}".format(match["id"], len(tabs), ", ".join(tabs.keys())))
+            self.logger.info("[%s] Found %s tabs : %s", match["id"], len(tabs), ", ".join(tabs.keys()))
 
         # Create players dict to match _parse_teams_score_data inputs
         player_dict = { "home": {}, "away": {}}
 
-        teams = tabs["Teams"].css("table tr:last-child .divTeams")
+        teams = _css(tabs["Teams"], "table tr:last-child .divTeams")
         if len(teams) < 2:
             # Hmm hmm ...
             return
 
+        yield from self._iter_players(response, teams, match, player_dict)
+
+        # Abort parsing if we don't have info on players
+        if not player_dict["home"] or not player_dict["away"]:
+            self.logger.error("[%s] Missing player data in \"Teams\" tab, aborting.", match["id"])
+            return
+        self.logger.info("[%s] Found %s players for home team (%s) and %s players for away team (%s)", match["id"], len(player_dict["home"]), match["home_team_id"], len(player_dict["away"]), match["away_team_id"])
+
+        # Index the players by name once, for the name lookups of the score and player stats parsing
+        name_indexes = { side: self._build_name_index(players) for side, players in player_dict.items() }
+
+        # 3) Parse top summary of the Teams tab to retrieve the names of the players who scored
+        self.logger.info("[%s] Begin score parsing ...", match["id"])
+        scores = _css(tabs["Teams"], ".liveTblScorers")
+        if scores and len(scores) > 1:
+            # Everything is pretty all right' man
+            yield from self._iter_scores(scores, match, match_stats, name_indexes)
+
+        # 3) Parse the "Match stats" page which provides team-level aggregated statistics
+        if "Match stats" in tabs:
+            agg = { match["home_team_id"]: {}, match["away_team_id"]: {} }
+            # For each metric, add respective values to the stats of the corresponding team
+            # (parsed values are already ints, first one wins as with the loader's TakeFirst)
+            for metric, scores in self._parse_match_stats(tabs["Match stats"], match):
+                for team_id, score in scores.items():
+                    agg[team_id].setdefault(metric, score)
+
+            # Then tag the structures with some useful metadata (for the pipeline) before yielding
+            for team_id, data in agg.items():
+                yield MatchExtraStats(match_id = match["id"], team_id = team_id, **data)
+
+        # 4) If available, parse the "{team} stats" page which provides player-level statistics
+        yield from self._iter_player_extra_stats(tabs, match, name_indexes)
+
+    def _iter_players(self, response, teams, match, player_dict):
+        """ Generator that handles the line-ups of the "Teams" tab.
+        Yields a PlayerStats() item and a request to the player page per player, and fills player_dict with the players found.
+        """
+
+        player_stats_fields = {
+            "number" : "td.liveTblTextGrn::text",
+            "position" : "td.liveTblColCtr::text",
+        }
+
         for index, team in enumerate(teams):
+            # Invariants of the team's players
+            is_home = index == 0
+            team_id = match["home_team_id"] if is_home else match["away_team_id"]
+            team_players = player_dict["home" if is_home else "away"]
             # For each team group (first team or replacements)
-            for position, group in enumerate(team.xpath("table")):
+            for position, group in enumerate(_xpath(team, "table")):
                 # For each player (discard first rows - subtitles)
-                players = group.css("tr.liveTblRowWht")[1:]
+                players = _css(group, "tr.liveTblRowWht")[1:]
                 for player in players:
                     # Get basic info
-                    player_loader = PlayerLoader(item = Player(), response = response, selector = player)
-                    player_loader.add_css("id", "a[class^=\"liveLineupText\"]::attr(href)", re = "\/([0-9]+)\.")
-                    player_loader.add_css("name", "a[class^=\"liveLineupText\"]::text")
+                    # (values are selected with the cached selectors, add_css would compile them per player)
+                    player_loader = PlayerLoader(item = Player(), response = response)
+                    player_loader.add_value("id", _css(player, "a[class^=\"liveLineupText\"]::attr(href)").extract(), re = "\/([0-9]+)\.")
+                    player_loader.add_value("name", _css(player, "a[class^=\"liveLineupText\"]::text").extract())
                     player_info = player_loader.load_item()
                     # Discard players without id
                     if not player_info:
                         continue
 
-                    # Go to the player page to scrape it
-                    yield response.follow(
-                        url = "/statsguru/rugby/player/{}.html".format(player_info["id"]),
-                        callback = self.player_info_parse,
-                        meta = { "player_info" : player_info }
-                    )
-
-                    player_stats_fields = {
-                        "number" : "td.liveTblTextGrn::text",
-                        "position" : "td.liveTblColCtr::text",
-                    }
+                    # Go to the player page to scrape it, once per crawl : players appear in many matches
+                    if player_info["id"] not in self._seen_players:
+                        self._seen_players.add(player_info["id"])
+                        yield response.follow(
+                            url = "/statsguru/rugby/player/{}.html".format(player_info["id"]),
+                            callback = self.player_info_parse,
+                            meta = { "player_info" : player_info }
+                        )
 
                     # Get match-specific info for each player
-                    player_stats_loader = PlayerStatsLoader(item = PlayerStats(), response = response, selector = player)
-                    player_stats_loader.add_value("player_id", player_info["id"])
-                    player_stats_loader.add_value("team_id", match["home_team_id"] if index == 0 else match["away_team_id"])
-                    player_stats_loader.add_value("match_id", match["id"])
-                    player_stats_loader.add_value("first_team", position == 0)
+                    player_stats_loader = PlayerStatsLoader(item = PlayerStats(), response = response)
+                    add = player_stats_loader.add_value
+                    add("player_id", player_info["id"])
+                    add("team_id", team_id)
+                    add("match_id", match["id"])
+                    add("first_team", position == 0)
                     for field, selector in player_stats_fields.items():
-                        player_stats_loader.add_css(field, selector)
+                        add(field, _css(player, selector).extract())
                     player_stats = player_stats_loader.load_item()
 
                     yield player_stats
 
                     # Populate player dict for later use
                     if player_info["id"] and player_info["name"]:
-                        player_dict["home" if index == 0 else "away"][player_info["id"]] = (player_info.get("name"), player_stats.get("position"), player_stats.get("number"))
-
-        # Abort parsing if we don't have info on players
-        if not player_dict["home"] or not player_dict["away"]:
-            self.logger.error("[{}] Missing player data in \"Teams\" tab, aborting.".format(match["id"]))
-            return
-        self.logger.info("[{}] Found {} players for home team ({}) and {} players for away team ({})".format(match["id"], len(player_dict["home"]), match["home_team_id"], len(player_dict["away"]), match["away_team_id"]))
-
-        # 3) Parse top summary of the Teams tab to retrieve the names of the players who scored
-        self.logger.info("[{}] Begin score parsing ...".format(match["id"]))
-        scores = tabs["Teams"].css(".liveTblScorers")
-        if scores and len(scores) > 1:
-            # Everything is pretty all right' man
-            # For each team (home and away)
-            for index in range(2):
-                team_scores = defaultdict(lambda: defaultdict(int))
-                for score in scores[index::2]:
-                    # Extract from html
-                    fields = (score.css(".liveTblTextGrn::text").extract_first(), score.css("td::text").extract_first())
-                    if not all(fields):
-                        self.logger.info("[{}] Skipping score entry, not all fields present. Skipping.", match["id"])
-                        continue
-
-                    # Format the parsed data
-                    event_type, event_data = [item.rstrip().replace("\n", "") for item in fields]
-                    if not event_type.lower() in ["pens", "tries", "drops", "cons"]:
-                        # Event type not supported
-                        self.logger.info("[{}] Unsupported event \"{}\". Skipping.".format(match["id"], event_type))
-                        continue
-                    self.logger.info("[{}] Handling event \"{}\" ...".format(match["id"], event_type))
-                    if event_data == "none":
-                        self.logger.info("[{}] ({}) No data for event. Skipping.".format(match["id"], event_type))
-                        continue
-
-                    # Do the regex matching
-                    # First, split the event string to get each player separately
-                    list_of_events = regex.split("\,(?! \d)", event_data)
-                    if not list_of_events:
-                        self.logger.warning("[{}] ({}) Can't extract player actions. Skipping.".format(match["id"], event_type))
-                        self.logger.debug("String : {}".format(event_data))
-                        continue
+                        team_players[player_info["id"]] = (player_info.get("name"), player_stats.get("position"), player_stats.get("number"))
 
-                    # Cleaning of trailing spaces
-                    list_of_events = [item.strip() for item in list_of_events]
-                    self.logger.debug(list_of_events)
-
-                    # For each event (corresponding to one player), parse the info
-                    # and yield the data structure
-                    for event in list_of_events:
-                        event_parsed = regex.match("((?:[\w\-\' ](?!\d))+) *([\d])*(?:\((?:(\d+)[, ]*)*\))*", event)
-                        if not event_parsed:
-                            self.logger.warning("[{}] ({}) Action parsing failed. Skipping.".format(match["id"], event_type))
-                            self.logger.debug("String : {}".format(event))
-                            continue
-
-                        name = event_parsed.captures(1)
-                        occurences = event_parsed.captures(2)
-                        times = event_parsed.captures(3)
-                        player_id = None
-
-                        if len(name) != 0:
-                            name = name[0].strip()
-                        else:
-                            # Can't do anything without a name bru'
-                            continue
-
-                        # Attempt to guess the player id
-                        try :
-                            player_id = self._get_player_id_from_name(name, player_dict["home" if index == 0 else "away"])
-                        except RuntimeError:
-                            # Drop game events that can't be associated to a player
-                            self.logger.warning("[{}] ({}) Unable to guess player id for \"{}\". Skipping.".format(match["id"], event_type, name))
-
-                        if player_id:
-                            if times:
-                                for time in times:
-                                    # We have some game events to emit
-                                    loader = GameEventLoader(item = GameEvent(), response = response)
-                                    loader.add_value("player_id", player_id)
-                                    loader.add_value("team_id", match["home_team_id"] if index == 0 else match["away_team_id"])
-                                    loader.add_value("match_id", match["id"])
-                                    loader.add_value("time", time)
-                                    loader.add_value("action_type", event_type.lower())
-                                    game_event = loader.load_item()
-                                    self.logger.info("[{}] ({}) Event : {} ({}) at time {}\"".format(game_event["match_id"], game_event["action_type"], name, game_event["player_id"], game_event["time"]))
-                                    yield game_event
-
-                        team_scores[player_id][event_type.lower()] += max(len(occurences)+1, len(times))
-
-                # Once we've processed all the scores for a given team, we yield
-                # the corresponding data structures
-                for player_id, player_score in team_scores.items():
-                    if player_id == None:
-                        continue
-                    loader = PlayerStatsLoader(item = PlayerStats(), response = response)
-                    loader.add_value("player_id", player_id)
-                    loader.add_value("team_id", match["home_team_id"] if index == 0 else match["away_team_id"])
-                    loader.add_value("match_id", match["id"])
-                    for stat_name, stat_value in player_score.items():
-                        loader.add_value(stat_name, stat_value)
-                    player_stats = loader.load_item()
-                    self.logger.info("[{}] Stats for {} : {}".format(match["id"], player_id, player_score))
-                    yield player_stats
+    def _iter_scores(self, scores, match, match_stats, name_indexes):
+        """ Generator that handles the scorers summary of the "Teams" tab.
+        Yields GameEvent() items per scoring time, plus the PlayerStats() and MatchStats() score totals of each team.
+        """
 
-                # Generate the MatchStats items
-                scores_summary = { "tries": 0, "cons": 0, "pens": 0, "drops": 0 }
-                for team_score in team_scores.values():
-                    for score_category, value in team_score.items():
-                        scores_summary[score_category] += value
+        match_id = match["id"]
+        # For each team (home and away)
+        for index in range(2):
+            # Invariants of the team's events
+            is_home = index == 0
+            team_id = match["home_team_id"] if is_home else match["away_team_id"]
+            team_index = name_indexes["home" if is_home else "away"]
+            scored = match_stats["scored"] if is_home else match_stats["conceded"]
+            conceded = match_stats["conceded"] if is_home else match_stats["scored"]
+            # Score counts of each player, laid out as _SCORE_TYPES
+            team_scores = defaultdict(lambda: array("i", _NO_SCORES))
+            for score in scores[index::2]:
+                # Extract from html
+                fields = (_css(score, ".liveTblTextGrn::text").extract_first(), _css(score, "td::text").extract_first())
+                if not all(fields):
+                    self.logger.info("[%s] Skipping score entry, not all fields present. Skipping.", match_id)
+                    continue
+
+                # Format the parsed data
+                event_type, event_data = [item.translate(_WS_TRANS).rstrip() for item in fields]
+                action_type = event_type.lower()
+                if not action_type in _SCORE_INDEX:
+                    # Event type not supported
+                    self.logger.info("[%s] Unsupported event \"%s\". Skipping.", match_id, event_type)
+                    continue
+                self.logger.info("[%s] Handling event \"%s\" ...", match_id, event_type)
+                if event_data == "none":
+                    self.logger.info("[%s] (%s) No data for event. Skipping.", match_id, event_type)
+                    continue
+
+                # Do the regex matching
+                # First, split the event string to get each player separately
+                list_of_events = _SPLIT_EVENTS_RE.split(event_data)
+                if not list_of_events:
+                    self.logger.warning("[%s] (%s) Can't extract player actions. Skipping.", match_id, event_type)
+                    self.logger.debug("String : %s", event_data)
+                    continue
+
+                self.logger.debug("Events : %s", list_of_events)
+
+                # For each event (corresponding to one player), parse the info
+                # and yield the data structure
+                yield from self._emit_events_for_team(list_of_events, event_type, action_type, match_id, team_id, team_index, team_scores)
+
+            # Once we've processed all the scores for a given team, we yield
+            # the corresponding data structures
+            for player_id, player_counts in team_scores.items():
+                if player_id is None:
+                    continue
+                # Only the score types the player actually scored
+                player_score = { score_type: count for score_type, count in zip(_SCORE_TYPES, player_counts) if count }
+                player_stats = PlayerStats(player_id = player_id, team_id = team_id, match_id = match_id, **player_score)
+                self.logger.info("[%s] Stats for %s : %s", match_id, player_id, player_score)
+                yield player_stats
+
+            # Generate the MatchStats items
+            # (counts of unidentified players included, zip transposes them into per score type columns)
+            scores_summary = dict(zip(_SCORE_TYPES, map(sum, zip(_NO_SCORES, *team_scores.values()))))
+
+            yield MatchStats(
+                match_id = match_id,
+                team_id = team_id,
+                scored = scored,
+                conceded = conceded,
+                **scores_summary)
+
+    def _emit_events_for_team(self, list_of_events, event_type, action_type, match_id, team_id, team_index, team_scores):
+        """ Generator that parses the scorer events of one score entry of a team.
+        Yields a GameEvent() item per scoring time and adds the score counts of each player to team_scores.
+        """
 
-                loader = MatchStatsLoader(item = MatchStats())
-                loader.add_value("match_id", match["id"])
-                loader.add_value("team_id", match["home_team_id"] if index == 0 else match["away_team_id"])
-                loader.add_value("scored", match_stats["scored"] if index == 0 else match_stats["conceded"])
-                loader.add_value("conceded", match_stats["conceded"] if index == 0 else match_stats["scored"])
-                for score_category, value in scores_summary.items():
-                    loader.add_value(score_category, value)
-                yield loader.load_item()
+        score_index = _SCORE_INDEX[action_type]
+        # The per-time event log is the chattiest one, check its level once
+        log_events = self.logger.isEnabledFor(logging.INFO)
+        for event in list_of_events:
+            # Cleaning of trailing spaces
+            event = event.strip()
+            if not event:
+                # Blank split (e.g. trailing comma), nothing to parse
+                continue
+            name, occurences, times = _parse_event(event)
+            player_id = None
 
-        # 3) Parse the "Match stats" page which provides team-level aggregated statistics
-        if "Match stats" in tabs:
-            loaders = {
-                match["home_team_id"]: MatchExtraStatsLoader(item = MatchExtraStats()),
-                match["away_team_id"]: MatchExtraStatsLoader(item = MatchExtraStats())
-            }
-            # For each metric, add respective values to the loader of the corresponding team
-            for metric, scores in self._parse_match_stats(tabs["Match stats"], match):
-                for team_id, score in scores.items():
-                    loaders[team_id].add_value(metric, score)
+            if not name:
+                # Can't do anything without a name bru'
+                self.logger.warning("[%s] (%s) Action parsing failed. Skipping.", match_id, event_type)
+                self.logger.debug("String : %s", event)
+                continue
 
-            # Then tag the structures with some useful metadata (for the pipeline) before yielding
-            for team_id, loader in loaders.items():
-                loader.add_value("match_id", match["id"])
-                loader.add_value("team_id", team_id)
-                yield loader.load_item()
+            # Attempt to guess the player id
+            try :
+                player_id = self._get_player_id_from_name(name, team_index)
+            except RuntimeError:
+                # Drop game events that can't be associated to a player
+                self.logger.warning("[%s] (%s) Unable to guess player id for \"%s\". Skipping.", match_id, event_type, name)
+
+            if player_id:
+                if times:
+                    for time in times:
+                        # We have some game events to emit
+                        # (ids are already ints and the action type is a supported one, no loader needed)
+                        game_event = GameEvent(player_id = player_id, team_id = team_id, match_id = match_id, time = int(time), action_type = action_type)
+                        if log_events:
+                            self.logger.info("[%s] (%s) Event : %s (%s) at time %s\"", match_id, action_type, name, player_id, game_event["time"])
+                        yield game_event
+
+            team_scores[player_id][score_index] += max(len(occurences)+1, len(times))
+
+    def _iter_player_extra_stats(self, tabs, match, name_indexes):
+        """ Generator that handles the per-team "{team} stats" tabs.
+        Yields a PlayerExtraStats() item per player row.
+        """
 
-        # 4) If available, parse the "{team} stats" page which provides player-level statistics
-        for index, tab in enumerate((tabs[title] for title in tabs.keys() if regex.search("^[a-zA-Z ]+ stats$", title))):
-            for player_row in tab.css("table tr") :
-                player_stats = self._parse_player_stats(player_row, potential_team = [player_dict["home"], player_dict["away"]], potential_team_id = [match["home_team_id"], match["away_team_id"]])
+        # Per-team tabs are titled "{team} stats", "Match stats" being the team-level one
+        for tab in (tab for title, tab in tabs.items() if title.endswith(" stats") and title != "Match stats"):
+            for player_row in _css(tab, "table tr") :
+                player_stats = self._parse_player_stats(player_row, potential_team = [name_indexes["home"], name_indexes["away"]], potential_team_id = [match["home_team_id"], match["away_team_id"]])
                 if player_stats:
                     loader = PlayerExtraStatsLoader(item = PlayerExtraStats())
-                    loader.add_value("match_id", match["id"])
+                    add = loader.add_value
+                    add("match_id", match["id"])
                     for key, value in player_stats.items():
-                        loader.add_value(key, value)
+                        add(key, value)
                     yield loader.load_item()